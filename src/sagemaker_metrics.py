@@ -3,13 +3,26 @@ Retrieves metrics for SageMaker Endpoints from CloudWatch.
 See https://docs.aws.amazon.com/sagemaker/latest/dg/monitoring-cloudwatch.html for
 full list of metrics.
 """
+import os
 import json
 import boto3
 import logging
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from pydantic import BaseModel
-from typing import List, Optional
+import pyarrow as pa
+from botocore.config import Config
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from pydantic import BaseModel, ValidationInfo, field_validator
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    # aiobotocore is optional, it is only needed for the async variants
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+except ImportError:
+    AioConfig = None
+    get_session = None
 
 # Setup logging
 logging.basicConfig(format='[%(asctime)s] p%(process)s {%(filename)s:%(lineno)d} %(levelname)s - %(message)s', level=logging.INFO)
@@ -22,115 +35,428 @@ class EndpointMetricParams(BaseModel):
     start_time: datetime
     end_time: datetime
     period: int = 60
+    aggregate_period: Optional[int] = None
+
+    @field_validator('aggregate_period')
+    @classmethod
+    def _check_aggregate_period(cls, aggregate_period: Optional[int], info: ValidationInfo) -> Optional[int]:
+        # CloudWatch only accepts periods that are multiples of 60 seconds for these metrics, and a value
+        # below period would return finer instead of aggregated data
+        if aggregate_period is None:
+            return aggregate_period
+        if aggregate_period <= 0 or aggregate_period % 60 != 0:
+            raise ValueError(f"aggregate_period must be a positive multiple of 60 seconds, got {aggregate_period}")
+        period = info.data.get('period')
+        if period is not None and aggregate_period < period:
+            raise ValueError(f"aggregate_period ({aggregate_period}) must be at least period ({period})")
+        return aggregate_period
+
+
+# In debug mode CloudWatch calls are not retried so throttling and other errors surface immediately.
+# The flag is read once at import and the client built from it is cached, so changing the
+# environment variable at runtime has no effect until the module is reloaded.
+CLOUDWATCH_DEBUG: bool = os.environ.get('CLOUDWATCH_DEBUG', 'false').lower() == 'true'
+
+# Size of the client connection pool, so concurrent callers sharing the client are not serialized
+CLOUDWATCH_MAX_POOL_CONNECTIONS = 20
+
+
+def _cw_client_config_args() -> dict:
+    """
+    Returns the botocore client config arguments for CloudWatch, no retries in debug mode and
+    adaptive retries, which rate limit the client when CloudWatch starts throttling, otherwise.
+    """
+    if CLOUDWATCH_DEBUG:
+        retries = {'max_attempts': 0, 'mode': 'standard'}
+    else:
+        retries = {'max_attempts': 3, 'mode': 'adaptive'}
+    return dict(retries=retries, max_pool_connections=CLOUDWATCH_MAX_POOL_CONNECTIONS)
+
+
+@lru_cache(maxsize=1)
+def _cw_client():
+    """
+    Returns a CloudWatch client shared across calls, creating it on first use.
+    boto3 clients are thread-safe, so the same client can be used by concurrent fetches.
+    """
+    return boto3.client('cloudwatch', config=Config(**_cw_client_config_args()))
+
+
+@lru_cache(maxsize=1)
+def _aio_session():
+    """
+    Returns an aiobotocore session shared across async calls, so service models are loaded once
+    and creating the per call async CloudWatch client stays cheap.
+    """
+    if get_session is None:
+        raise ImportError("aiobotocore is required for the async metric helpers, install it with `pip install aiobotocore`")
+    return get_session()
 
-class UtilizationDatapoint(BaseModel):
-    Timestamp: datetime
-    Average: float
 
-class InvocationDatapoint(BaseModel):
-    Timestamp: datetime
-    Value: float
+# Maximum number of datapoints returned by a single GetMetricData request
+MAX_METRIC_DATAPOINTS = 100800
 
-# Pydantic models for the structure of data before DataFrame creation
-class UtilizationMetricRecord(BaseModel):
-    EndpointName: str
-    Timestamp: datetime
-    MetricName: str
-    Average: float
+# Number of metric responses kept by the response cache
+METRICS_CACHE_SIZE = 128
 
-class InvocationMetricRecord(BaseModel):
-    EndpointName: str
-    Timestamp: datetime
-    MetricName: str
-    Value: float
+# Windows ending less than this long ago may still receive datapoints, their cached responses
+# expire after METRICS_CACHE_TTL_SECONDS, older windows are immutable and cached until evicted
+METRICS_CACHE_RECENT_WINDOW = timedelta(hours=1)
+METRICS_CACHE_TTL_SECONDS = 300
 
+# Utilization metrics as (metric name, statistic) pairs, queried with ids starting with _UTIL_QUERY_PREFIX
+_UTIL_QUERY_PREFIX = "u_"
+_UTIL_NAMESPACE = "/aws/sagemaker/Endpoints"
+_UTIL_METRICS = (("CPUUtilization", "Average"),
+                 ("MemoryUtilization", "Average"),
+                 ("DiskUtilization", "Average"),
+                 ("InferenceLatency", "Average"),
+                 ("GPUUtilization", "Average"),
+                 ("GPUMemoryUtilization", "Average"))
 
-def _get_endpoint_utilization_metrics(endpoint_name: str,
-                                      variant_name: str,
-                                      start_time: datetime,
-                                      end_time: datetime,
-                                      period : int = 60) -> pd.DataFrame:
+# Invocation metrics as (metric name, statistic) pairs, queried with ids starting with _INVOC_QUERY_PREFIX
+_INVOC_QUERY_PREFIX = "i_"
+_INVOC_NAMESPACE = "AWS/SageMaker"
+_INVOC_METRICS = (("Invocations", "Sum"),
+                  ("Invocation4XXErrors", "Sum"),
+                  ("Invocation5XXErrors", "Sum"),
+                  ("ModelLatency", "Average"),
+                  ("InvocationsPerInstance", "Sum"))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """
+    Returns the datetime as a timezone aware UTC datetime, naive datetimes are treated as UTC.
     """
-    Retrieves utilization metrics for a specified SageMaker endpoint within a given time range.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _cache_ttl_bucket(end_time: datetime) -> Optional[int]:
+    """
+    Returns the time bucket used to expire cached responses for windows ending in the recent past.
 
     Parameters:
+    - end_time (datetime): The end time of the metrics window, naive datetimes are treated as UTC.
+
+    Returns:
+    - Optional[int]: The current METRICS_CACHE_TTL_SECONDS bucket for recent windows, None for historical windows.
+    """
+    now = datetime.now(timezone.utc)
+    if now - _as_utc(end_time) > METRICS_CACHE_RECENT_WINDOW:
+        return None
+    return int(now.timestamp() // METRICS_CACHE_TTL_SECONDS)
+
+
+def _cached_metrics(fetch):
+    """
+    Decorator caching the DataFrames returned by an endpoint metrics fetch, keyed by endpoint, variant,
+    time range, period and aggregate period, so repeated calls for the same window (dashboards, retries)
+    skip CloudWatch. Failed fetches are not cached. Callers get a copy so the cached frame cannot be modified.
+    """
+    @lru_cache(maxsize=METRICS_CACHE_SIZE)
+    def _cached_fetch(endpoint_name: str,
+                      variant_name: str,
+                      start_time_iso: str,
+                      end_time_iso: str,
+                      period: int,
+                      aggregate_period: Optional[int],
+                      ttl_bucket: Optional[int]) -> pd.DataFrame:
+        return fetch(endpoint_name,
+                     variant_name,
+                     datetime.fromisoformat(start_time_iso),
+                     datetime.fromisoformat(end_time_iso),
+                     period,
+                     aggregate_period)
+
+    @wraps(fetch)
+    def wrapper(endpoint_name: str,
+                variant_name: str,
+                start_time: datetime,
+                end_time: datetime,
+                period: int = 60,
+                aggregate_period: Optional[int] = None) -> pd.DataFrame:
+        df = _cached_fetch(endpoint_name,
+                           variant_name,
+                           start_time.isoformat(),
+                           end_time.isoformat(),
+                           period,
+                           aggregate_period,
+                           _cache_ttl_bucket(end_time))
+        return df.copy()
+
+    wrapper.cache_clear = _cached_fetch.cache_clear
+    wrapper.cache_info = _cached_fetch.cache_info
+    return wrapper
+
+
+def _build_metric_data_query(query_id: str,
+                             namespace: str,
+                             metric_name: str,
+                             endpoint_name: str,
+                             variant_name: str,
+                             period: int,
+                             stat: str) -> dict:
+    """
+    Builds a single GetMetricData query for an endpoint variant metric.
+
+    Parameters:
+    - query_id (str): Unique id of the query within the request, used to match results.
+    - namespace (str): The CloudWatch namespace of the metric.
+    - metric_name (str): The name of the metric.
     - endpoint_name (str): The name of the SageMaker endpoint.
     - variant_name (str): The name of the endpoint variant.
+    - period (int): The granularity, in seconds, of the returned data points.
+    - stat (str): The statistic to retrieve, e.g. 'Average' or 'Sum'.
+
+    Returns:
+    - dict: A MetricDataQuery for use in GetMetricData.
+    """
+    return {
+        'Id': query_id,
+        'MetricStat': {
+            'Metric': {
+                'Namespace': namespace,
+                'MetricName': metric_name,
+                'Dimensions': [
+                    {
+                        'Name': 'EndpointName',
+                        'Value': endpoint_name
+                    },
+                    {
+                        'Name': 'VariantName',
+                        'Value': variant_name
+                    }
+                ]
+            },
+            'Period': period,  # Period in seconds
+            'Stat': stat  # Statistic to retrieve
+        },
+        'ReturnData': True,
+    }
+
+
+def _metric_frame(metric_name: str, timestamps: list, values: list) -> pd.DataFrame:
+    """
+    Builds a single metric DataFrame indexed on Timestamp from GetMetricData result arrays.
+
+    Parameters:
+    - metric_name (str): The name of the metric, used as the column name.
+    - timestamps (list): Timestamps of the datapoints.
+    - values (list): Values of the datapoints.
+
+    Returns:
+    - Dataframe: A Dataframe with a UTC Timestamp index and a float64 column for the metric.
+    """
+    # Convert both arrays in one vectorized step each, explicit dtypes skip per-element type inference.
+    # pd.to_datetime is used over np.array(..., dtype='datetime64[ns]') as the SDK returns timezone aware
+    # datetimes, which numpy converts much slower and with a warning.
+    timestamp_index = pd.to_datetime(timestamps, utc=True).rename('Timestamp')
+    value_array = np.asarray(values, dtype=np.float64)
+    # The arrays are freshly built, so let the DataFrame use them without another copy
+    return pd.DataFrame({metric_name: value_array}, index=timestamp_index, copy=False)
+
+
+def _join_metric_frames(metric_frames: List[pd.DataFrame], endpoint_name: str) -> pd.DataFrame:
+    """
+    Joins single metric DataFrames indexed on Timestamp into one wide DataFrame.
+
+    Parameters:
+    - metric_frames (List[DataFrame]): One DataFrame per metric, indexed on Timestamp with the metric name as its column.
+    - endpoint_name (str): The name of the SageMaker endpoint, added as a column to the result.
+
+    Returns:
+    - Dataframe: A Dataframe indexed on a sorted Timestamp index with EndpointName and one column per metric.
+    """
+    # A single index aligned concat, instead of pairwise joins or reshaping long rows
+    df = pd.concat(metric_frames, axis=1, join='outer', sort=True)
+    df.insert(0, 'EndpointName', endpoint_name)
+    return df
+
+
+def _align_to_period(start_time: datetime, end_time: datetime, period: int) -> Tuple[datetime, datetime]:
+    """
+    Widens a time range so both ends fall on multiples of the period, which CloudWatch serves faster.
+
+    Parameters:
+    - start_time (datetime): The start time, rounded down to the period. Naive datetimes are treated as UTC.
+    - end_time (datetime): The end time, rounded up to the period. Naive datetimes are treated as UTC.
+    - period (int): The granularity, in seconds, of the queries.
+
+    Returns:
+    - Tuple[datetime, datetime]: The aligned start and end times in UTC.
+    """
+    step = timedelta(seconds=period)
+    # Align against the UTC epoch, boundaries in the caller's timezone are off for non whole offsets
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start_time = _as_utc(start_time)
+    end_time = _as_utc(end_time)
+    start_time = start_time - (start_time - epoch) % step
+    end_offset = (end_time - epoch) % step
+    if end_offset:
+        end_time = end_time + (step - end_offset)
+    return start_time, end_time
+
+
+def _merge_metric_data_pages(pages: Iterable[dict]) -> List[dict]:
+    """
+    Merges GetMetricData response pages into a single MetricDataResult per query id.
+
+    Parameters:
+    - pages (Iterable[dict]): GetMetricData responses, one per page.
+
+    Returns:
+    - List[dict]: One MetricDataResult per query id with the Timestamps and Values of all pages.
+    """
+    results_by_id = {}
+    for page in pages:
+        for result in page['MetricDataResults']:
+            merged = results_by_id.setdefault(result['Id'], {'Id': result['Id'], 'Timestamps': [], 'Values': []})
+            merged['Timestamps'].extend(result['Timestamps'])
+            merged['Values'].extend(result['Values'])
+    return list(results_by_id.values())
+
+
+def _get_metric_data_results(client,
+                             metric_data_queries: List[dict],
+                             start_time: datetime,
+                             end_time: datetime,
+                             period: int) -> List[dict]:
+    """
+    Retrieves GetMetricData results for the queries, following pagination until all datapoints are read.
+
+    Parameters:
+    - client: The CloudWatch client to use.
+    - metric_data_queries (List[dict]): The queries to run.
     - start_time (datetime): The start time for the metrics data.
     - end_time (datetime): The end time for the metrics data.
-    - period (int): The granularity, in seconds, of the returned data points. Default is 60 seconds.
+    - period (int): The granularity, in seconds, of the queries, used to align the time range.
 
     Returns:
-    - Dataframe: A Dataframe containing metric values for utilization metrics like CPU and GPU Usage.
+    - List[dict]: One MetricDataResult per query id with the datapoints of all pages.
     """
-    
-    metrics = ["CPUUtilization",
-               "MemoryUtilization",
-               "DiskUtilization",
-               "InferenceLatency",
-               "GPUUtilization",
-               "GPUMemoryUtilization"]
-    
-    client = boto3.client('cloudwatch')
+    start_time, end_time = _align_to_period(start_time, end_time, period)
+    paginator = client.get_paginator('get_metric_data')
+    pages = paginator.paginate(MetricDataQueries=metric_data_queries,
+                               StartTime=start_time,
+                               EndTime=end_time,
+                               PaginationConfig={'PageSize': MAX_METRIC_DATAPOINTS})
+    metric_data_results = _merge_metric_data_pages(pages)
+    logger.debug(metric_data_results)
+    return metric_data_results
+
+
+def _endpoint_metric_queries(namespace: str,
+                             metric_specs: Tuple[Tuple[str, str], ...],
+                             query_id_prefix: str,
+                             endpoint_name: str,
+                             variant_name: str,
+                             period: int) -> List[dict]:
+    """
+    Builds the GetMetricData queries for a set of metrics of an endpoint variant.
+
+    Parameters:
+    - namespace (str): The CloudWatch namespace of the metrics.
+    - metric_specs (Tuple[Tuple[str, str], ...]): (metric name, statistic) pairs, e.g. _UTIL_METRICS.
+    - query_id_prefix (str): Prefix of the query ids, used to tell the results of different metric sets apart.
+    - endpoint_name (str): The name of the SageMaker endpoint.
+    - variant_name (str): The name of the endpoint variant.
+    - period (int): The granularity, in seconds, of the returned data points.
+
+    Returns:
+    - List[dict]: One MetricDataQuery per metric.
+    """
+    return [_build_metric_data_query(query_id=f"{query_id_prefix}{i}",
+                                     namespace=namespace,
+                                     metric_name=metric_name,
+                                     endpoint_name=endpoint_name,
+                                     variant_name=variant_name,
+                                     period=period,
+                                     stat=stat)
+            for i, (metric_name, stat) in enumerate(metric_specs)]
+
+
+def _all_endpoint_metric_queries(endpoint_name: str,
+                                 variant_name: str,
+                                 period: int,
+                                 aggregate_period: Optional[int] = None) -> List[dict]:
+    """
+    Builds the GetMetricData queries for both the utilization and invocation metrics of an endpoint variant,
+    so they can be fetched in a single request across both namespaces.
+
+    Parameters:
+    - endpoint_name (str): The name of the SageMaker endpoint.
+    - variant_name (str): The name of the endpoint variant.
+    - period (int): The granularity, in seconds, of the returned data points.
+    - aggregate_period (Optional[int]): If set, CloudWatch averages the utilization metrics over this many seconds
+      server-side and returns one data point per aggregate period instead of per period.
+
+    Returns:
+    - List[dict]: The utilization queries (ids prefixed with _UTIL_QUERY_PREFIX) followed by the invocation
+      queries (ids prefixed with _INVOC_QUERY_PREFIX).
+    """
+    # Let CloudWatch do the averaging rather than pulling fine grained data points
+    utilization_period = aggregate_period or period
+    return (_endpoint_metric_queries(_UTIL_NAMESPACE, _UTIL_METRICS, _UTIL_QUERY_PREFIX,
+                                     endpoint_name, variant_name, utilization_period)
+            + _endpoint_metric_queries(_INVOC_NAMESPACE, _INVOC_METRICS, _INVOC_QUERY_PREFIX,
+                                       endpoint_name, variant_name, period))
+
+
+def _metric_results_to_df(metric_data_results: List[dict],
+                          metric_data_queries: List[dict],
+                          endpoint_name: str,
+                          variant_name: str) -> pd.DataFrame:
+    """
+    Converts GetMetricData results into a wide DataFrame with one column per metric.
+
+    Parameters:
+    - metric_data_results (List[dict]): The MetricDataResults returned by GetMetricData.
+    - metric_data_queries (List[dict]): The queries that produced the results, used to map result ids to metric names.
+    - endpoint_name (str): The name of the SageMaker endpoint.
+    - variant_name (str): The name of the endpoint variant.
+
+    Returns:
+    - Dataframe: A Dataframe indexed on Timestamp with EndpointName and one column per queried metric.
+    """
+    metric_names_by_id = {query['Id']: query['MetricStat']['Metric']['MetricName'] for query in metric_data_queries}
+    expected_columns = ['EndpointName'] + list(metric_names_by_id.values())
     data = []
-    namespace = "/aws/sagemaker/Endpoints"
-    
-    for metric_name in metrics:
-        logger.debug(f"_get_endpoint_utilization_metrics, endpoint_name={endpoint_name}, variant_name={variant_name}, "
-                     f"metric_name={metric_name}, start_time={start_time}, end_time={end_time}")
-        response = client.get_metric_statistics(
-            Namespace=namespace,
-            MetricName=metric_name,
-            Dimensions=[
-                {
-                    'Name': 'EndpointName',
-                    'Value': endpoint_name
-                },
-                {
-                    'Name': 'VariantName',
-                    'Value': variant_name
-                }
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=period,
-            Statistics=['Average']  # You can also use 'Sum', 'Minimum', 'Maximum', 'SampleCount'
-        )
-        logger.debug(response)
-        for datapoint_raw in response['Datapoints']:
-            # Validate with Pydantic before adding
-            datapoint = UtilizationDatapoint(**datapoint_raw)
-            data.append(UtilizationMetricRecord(
-                EndpointName=endpoint_name, 
-                Timestamp=datapoint.Timestamp,
-                MetricName=metric_name,
-                Average=datapoint.Average
-            ).dict()) # Convert back to dict for DataFrame creation
+    for result in metric_data_results:
+        # Metrics without data (e.g. GPU metrics on CPU instances) are common, skip them before building any frame
+        if not result['Values']:
+            continue
+        metric_name = metric_names_by_id[result['Id']]
+        # Values come from the typed SDK response, so build the frame column-wise without per-row validation
+        data.append(_metric_frame(metric_name, result['Timestamps'], result['Values']))
+
+    # Warn about each set of metrics that has no data at all
+    for query_id_prefix, metric_type in ((_UTIL_QUERY_PREFIX, 'utilization'), (_INVOC_QUERY_PREFIX, 'invocation')):
+        if not any(result['Values'] for result in metric_data_results if result['Id'].startswith(query_id_prefix)):
+            logger.warning(f"No {metric_type} datapoints found for {endpoint_name} / {variant_name}")
 
     # Create a DataFrame from the collected data
     if not data:
-        logger.warning(f"No utilization datapoints found for {endpoint_name} / {variant_name}")
         # Return empty DataFrame with expected columns if no data
-        return pd.DataFrame(columns=['Timestamp', 'EndpointName'] + metrics)
-        
-    df = pd.DataFrame(data)
+        return pd.DataFrame(columns=expected_columns,
+                            index=pd.DatetimeIndex([], tz='UTC', name='Timestamp'))
 
-    # Pivot the DataFrame to have metrics as columns
-    df_pivot = df.pivot_table(index=['Timestamp', 'EndpointName'], columns='MetricName', values='Average').reset_index()
-    
-    # Remove the index column heading
-    sm_utilization_metrics_df = df_pivot.rename_axis(None, axis=1)
-    
-    return sm_utilization_metrics_df
+    # Each metric already has its own result, so join them on Timestamp instead of pivoting.
+    # Metrics that had no data are added back as all NaN columns so the schema is always the same.
+    return _join_metric_frames(data, endpoint_name).reindex(columns=expected_columns)
 
 
-def _get_endpoint_invocation_metrics(endpoint_name: str,
-                                     variant_name: str,
-                                     start_time: datetime,
-                                     end_time: datetime,
-                                     period : int = 60):
+@_cached_metrics
+def _fetch_all_endpoint_metrics(endpoint_name: str,
+                                variant_name: str,
+                                start_time: datetime,
+                                end_time: datetime,
+                                period : int = 60,
+                                aggregate_period: Optional[int] = None) -> pd.DataFrame:
     """
-    Retrieves Invocation metrics for a specified SageMaker endpoint within a given time range.
+    Retrieves utilization and invocation metrics for a specified SageMaker endpoint within a given time range,
+    using a single paginated GetMetricData request across both namespaces.
 
     Parameters:
     - endpoint_name (str): The name of the SageMaker endpoint.
@@ -138,88 +464,105 @@ def _get_endpoint_invocation_metrics(endpoint_name: str,
     - start_time (datetime): The start time for the metrics data.
     - end_time (datetime): The end time for the metrics data.
     - period (int): The granularity, in seconds, of the returned data points. Default is 60 seconds.
+    - aggregate_period (Optional[int]): If set, CloudWatch averages the utilization metrics over this many seconds
+      server-side and returns one data point per aggregate period instead of per period.
 
     Returns:
-    - Dataframe: A Dataframe containing metric values for Invocation metrics like Invocations and Model Latency.
+    - Dataframe: A Dataframe indexed on Timestamp containing utilization metrics like CPU and GPU Usage and
+      invocation metrics like Invocations and Model Latency.
     """
-    metric_names = ["Invocations",
-                    "Invocation4XXErrors",
-                    "Invocation5XXErrors",
-                    "ModelLatency",
-                    "InvocationsPerInstance"]
-    
-    # Initialize a session using Amazon CloudWatch
-    client = boto3.client('cloudwatch')
+    client = _cw_client()
 
-    namespace = "AWS/SageMaker"
-    data = []
-    
-    for metric_name in metric_names:
-        if metric_name == 'ModelLatency':
-            stat = 'Average'
-        else:
-            stat = 'Sum'
-        logger.debug(f"_get_endpoint_invocation_metrics, endpoint_name={endpoint_name}, variant_name={variant_name}, "
-                     f"metric_name={metric_name}, start_time={start_time}, end_time={end_time}")
-        # Get metric data for the specified metric
-        response = client.get_metric_data(
-            MetricDataQueries=[
-                {
-                    'Id': f'metric_{metric_name}',
-                    'MetricStat': {
-                        'Metric': {
-                            'Namespace': namespace,
-                            'MetricName': metric_name,
-                            'Dimensions': [
-                                {
-                                    'Name': 'EndpointName',
-                                    'Value': endpoint_name
-                                },
-                                {
-                                    'Name': 'VariantName',
-                                    'Value': variant_name
-                                }
-                            ]
-                        },
-                        'Period': period,  # Period in seconds
-                        'Stat': stat  # Statistic to retrieve
-                    },
-                    'ReturnData': True,
-                },
-            ],
-            StartTime=start_time,
-            EndTime=end_time
-        )
-        logger.debug(response)
-        # Extract the data points from the response
-        timestamps = response['MetricDataResults'][0]['Timestamps']
-        values = response['MetricDataResults'][0]['Values']
-        
-        for timestamp_raw, value_raw in zip(timestamps, values):
-            # Validate with Pydantic
-            datapoint = InvocationDatapoint(Timestamp=timestamp_raw, Value=value_raw)
-            data.append(InvocationMetricRecord(
-                EndpointName=endpoint_name, 
-                Timestamp=datapoint.Timestamp,
-                MetricName=metric_name,
-                Value=datapoint.Value
-            ).dict()) # Convert back to dict for DataFrame creation
+    metric_data_queries = _all_endpoint_metric_queries(endpoint_name, variant_name, period, aggregate_period)
+    logger.debug(f"_fetch_all_endpoint_metrics, endpoint_name={endpoint_name}, variant_name={variant_name}, "
+                 f"start_time={start_time}, end_time={end_time}, period={period}, aggregate_period={aggregate_period}")
+    # Align to the invocation period, aligning to the coarser aggregate period would widen
+    # the invocation queries beyond the requested window
+    metric_data_results = _get_metric_data_results(client, metric_data_queries, start_time, end_time, period)
+    return _metric_results_to_df(metric_data_results, metric_data_queries, endpoint_name, variant_name)
 
-    # Create a DataFrame from the collected data
-    if not data:
-        logger.warning(f"No invocation datapoints found for {endpoint_name} / {variant_name}")
-        # Return empty DataFrame with expected columns if no data
-        return pd.DataFrame(columns=['Timestamp', 'EndpointName'] + metric_names)
-        
-    df = pd.DataFrame(data)
-    
-    # Pivot the DataFrame to have metrics as columns
-    df_pivot = df.pivot_table(index=['Timestamp', 'EndpointName'], columns='MetricName', values='Value').reset_index()
-    
-    # Remove the index column heading
-    sm_invocation_metrics_df = df_pivot.rename_axis(None, axis=1)
-    
-    return sm_invocation_metrics_df
+
+async def _get_metric_data_results_async(metric_data_queries: List[dict],
+                                         start_time: datetime,
+                                         end_time: datetime,
+                                         period: int) -> List[dict]:
+    """
+    Retrieves GetMetricData results with aiobotocore, following pagination until all datapoints are read.
+
+    Parameters:
+    - metric_data_queries (List[dict]): The queries to run.
+    - start_time (datetime): The start time for the metrics data.
+    - end_time (datetime): The end time for the metrics data.
+    - period (int): The granularity, in seconds, of the queries, used to align the time range.
+
+    Returns:
+    - List[dict]: One MetricDataResult per query id with the datapoints of all pages.
+    """
+    start_time, end_time = _align_to_period(start_time, end_time, period)
+    async with _aio_session().create_client('cloudwatch', config=AioConfig(**_cw_client_config_args())) as client:
+        paginator = client.get_paginator('get_metric_data')
+        pages = paginator.paginate(MetricDataQueries=metric_data_queries,
+                                   StartTime=start_time,
+                                   EndTime=end_time,
+                                   PaginationConfig={'PageSize': MAX_METRIC_DATAPOINTS})
+        pages = [page async for page in pages]
+    metric_data_results = _merge_metric_data_pages(pages)
+    logger.debug(metric_data_results)
+    return metric_data_results
+
+
+async def _fetch_all_endpoint_metrics_async(endpoint_name: str,
+                                            variant_name: str,
+                                            start_time: datetime,
+                                            end_time: datetime,
+                                            period : int = 60,
+                                            aggregate_period: Optional[int] = None) -> pd.DataFrame:
+    """
+    Async variant of _fetch_all_endpoint_metrics, requires aiobotocore. Responses are not cached.
+    """
+    metric_data_queries = _all_endpoint_metric_queries(endpoint_name, variant_name, period, aggregate_period)
+    metric_data_results = await _get_metric_data_results_async(metric_data_queries, start_time, end_time, period)
+    return _metric_results_to_df(metric_data_results, metric_data_queries, endpoint_name, variant_name)
+
+
+def _to_arrow_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts a wide endpoint metrics DataFrame to PyArrow backed dtypes, which use less memory than
+    the default NumPy layout and represent missing metric values as nulls instead of NaN fills.
+
+    Parameters:
+    - df (Dataframe): A Dataframe with Timestamp, EndpointName and one float column per metric.
+
+    Returns:
+    - Dataframe: The same Dataframe with PyArrow backed columns.
+    """
+    dtypes = {column: pd.ArrowDtype(pa.float64()) for column in df.columns}
+    dtypes['Timestamp'] = pd.ArrowDtype(pa.timestamp('ms', tz='UTC'))
+    dtypes['EndpointName'] = pd.ArrowDtype(pa.string())
+    return df.astype(dtypes)
+
+
+def _finalize_endpoint_metrics(caller: str, endpoint_name: str, endpoint_metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turns the Timestamp indexed endpoint metrics into the DataFrame returned to callers.
+
+    Parameters:
+    - caller (str): Name of the calling entrypoint, used as the prefix of the log messages.
+    - endpoint_name (str): The name of the SageMaker endpoint.
+    - endpoint_metrics_df (Dataframe): Utilization and invocation metrics indexed on Timestamp, may be empty.
+
+    Returns:
+    - Dataframe: A PyArrow backed Dataframe containing metric values for Utilization and Invocation metrics, empty if there is no data.
+    """
+    if endpoint_metrics_df.empty:
+        logger.warning(f"No utilization or invocation metrics found for endpoint={endpoint_name}")
+        return pd.DataFrame() # Return empty dataframe
+
+    endpoint_metrics_df = _to_arrow_dtypes(endpoint_metrics_df.reset_index())
+    logger.info(f"{caller}, shape of final metrics for "
+                f"endpoint={endpoint_name} is {endpoint_metrics_df.shape}")
+    logger.info(f"{caller}, endpoint_metrics_df=\n{endpoint_metrics_df.head()}")
+    return endpoint_metrics_df
 
 
 def get_endpoint_metrics(params: EndpointMetricParams) -> Optional[pd.DataFrame]:
@@ -227,7 +570,8 @@ def get_endpoint_metrics(params: EndpointMetricParams) -> Optional[pd.DataFrame]
     Retrieves Invocation and Utilization metrics for a specified SageMaker endpoint within a given time range.
 
     Parameters:
-    - params (EndpointMetricParams): Pydantic model containing endpoint name, variant name, start time, end time, and period.
+    - params (EndpointMetricParams): Pydantic model containing endpoint name, variant name, start time, end time, period
+      and an optional aggregate period for the utilization metrics.
 
     Returns:
     - Optional[Dataframe]: A Dataframe containing metric values for Utilization and Invocation metrics, or None if an error occurs.
@@ -235,46 +579,16 @@ def get_endpoint_metrics(params: EndpointMetricParams) -> Optional[pd.DataFrame]
     
     endpoint_metrics_df: Optional[pd.DataFrame] = None
     try:
-        logger.info(f"get_endpoint_metrics, going to retrieve endpoint utlization metrics for "
+        logger.info(f"get_endpoint_metrics, going to retrieve endpoint utlization and invocation metrics for "
                     f"endpoint={params.endpoint_name}, variant_name={params.variant_name}, start_time={params.start_time}, "
                     f"end_time={params.end_time}, period={params.period}")
-        utilization_metrics_df = _get_endpoint_utilization_metrics(endpoint_name=params.endpoint_name,
-                                                                   variant_name=params.variant_name,
-                                                                   start_time=params.start_time,
-                                                                   end_time=params.end_time,
-                                                                   period=params.period)
-        logger.info(f"get_endpoint_metrics, going to retrieve endpoint invocation metrics for "
-                    f"endpoint={params.endpoint_name}, variant_name={params.variant_name}, start_time={params.start_time}, "
-                    f"end_time={params.end_time}, period={params.period}")
-        invocation_metrics_df = _get_endpoint_invocation_metrics(endpoint_name=params.endpoint_name,
-                                                                 variant_name=params.variant_name,
-                                                                 start_time=params.start_time,
-                                                                 end_time=params.end_time,
-                                                                 period=params.period)
-
-        # Handle cases where one or both dataframes might be empty
-        if utilization_metrics_df.empty and invocation_metrics_df.empty:
-             logger.warning(f"No utilization or invocation metrics found for endpoint={params.endpoint_name}")
-             return pd.DataFrame() # Return empty dataframe
-        elif utilization_metrics_df.empty:
-            logger.warning(f"No utilization metrics found for endpoint={params.endpoint_name}, returning only invocation metrics.")
-            endpoint_metrics_df = invocation_metrics_df
-        elif invocation_metrics_df.empty:
-            logger.warning(f"No invocation metrics found for endpoint={params.endpoint_name}, returning only utilization metrics.")
-            endpoint_metrics_df = utilization_metrics_df
-        else:
-            # Merge only if both have data
-            endpoint_metrics_df = pd.merge(utilization_metrics_df,
-                                        invocation_metrics_df,
-                                        on=['Timestamp', 'EndpointName'],
-                                        how='outer')
-        
-        if endpoint_metrics_df is not None and not endpoint_metrics_df.empty:
-            logger.info(f"get_endpoint_metrics, shape of final metrics for "
-                        f"endpoint={params.endpoint_name} is {endpoint_metrics_df.shape}")
-            logger.info(f"get_endpoint_metrics, endpoint_metrics_df=\n{endpoint_metrics_df.head()}")
-        else:
-             logger.info(f"get_endpoint_metrics, final dataframe is empty or None for endpoint={params.endpoint_name}")
+        endpoint_metrics_df = _fetch_all_endpoint_metrics(endpoint_name=params.endpoint_name,
+                                                          variant_name=params.variant_name,
+                                                          start_time=params.start_time,
+                                                          end_time=params.end_time,
+                                                          period=params.period,
+                                                          aggregate_period=params.aggregate_period)
+        endpoint_metrics_df = _finalize_endpoint_metrics('get_endpoint_metrics', params.endpoint_name, endpoint_metrics_df)
              
     except Exception as e:
         logger.error(f"get_endpoint_metrics, exception occured while retrieving metrics for {params.endpoint_name}, "
@@ -282,4 +596,32 @@ def get_endpoint_metrics(params: EndpointMetricParams) -> Optional[pd.DataFrame]
         # In case of exception, ensure None is returned as per type hint
         return None 
 
-    return endpoint_metrics_df
\ No newline at end of file
+    return endpoint_metrics_df
+
+
+async def get_endpoint_metrics_async(params: EndpointMetricParams) -> Optional[pd.DataFrame]:
+    """
+    Async variant of get_endpoint_metrics for callers already running an event loop, requires aiobotocore.
+
+    Parameters:
+    - params (EndpointMetricParams): Pydantic model containing endpoint name, variant name, start time, end time, period
+      and an optional aggregate period for the utilization metrics.
+
+    Returns:
+    - Optional[Dataframe]: A Dataframe containing metric values for Utilization and Invocation metrics, or None if an error occurs.
+    """
+    try:
+        logger.info(f"get_endpoint_metrics_async, going to retrieve endpoint utlization and invocation metrics for "
+                    f"endpoint={params.endpoint_name}, variant_name={params.variant_name}, start_time={params.start_time}, "
+                    f"end_time={params.end_time}, period={params.period}")
+        endpoint_metrics_df = await _fetch_all_endpoint_metrics_async(endpoint_name=params.endpoint_name,
+                                                                      variant_name=params.variant_name,
+                                                                      start_time=params.start_time,
+                                                                      end_time=params.end_time,
+                                                                      period=params.period,
+                                                                      aggregate_period=params.aggregate_period)
+        return _finalize_endpoint_metrics('get_endpoint_metrics_async', params.endpoint_name, endpoint_metrics_df)
+    except Exception as e:
+        logger.error(f"get_endpoint_metrics_async, exception occured while retrieving metrics for {params.endpoint_name}, "
+                     f"exception={e}")
+        return None
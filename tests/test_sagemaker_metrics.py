@@ -0,0 +1,302 @@
+import pytest
+import asyncio
+import pandas as pd
+import pyarrow as pa
+from datetime import datetime, timedelta, timezone
+import src.sagemaker_metrics as sagemaker_metrics
+from src.sagemaker_metrics import _align_to_period, _fetch_all_endpoint_metrics
+
+T0 = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+class StubPaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, **kwargs):
+        self.client.requests.append(kwargs)
+        if self.client.error is not None:
+            raise self.client.error
+        return iter(self.client.pages)
+
+
+class StubCloudWatchClient:
+    """Stand-in for the boto3 CloudWatch client, returns the given GetMetricData pages."""
+    def __init__(self, pages=None, error=None):
+        self.pages = pages or []
+        self.error = error
+        self.requests = []
+
+    def get_paginator(self, operation_name):
+        assert operation_name == 'get_metric_data'
+        return StubPaginator(self)
+
+
+class StubAsyncPaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, **kwargs):
+        self.client.requests.append(kwargs)
+
+        async def _pages():
+            for page in self.client.pages:
+                yield page
+        return _pages()
+
+
+class StubAsyncCloudWatchClient(StubCloudWatchClient):
+    """Stand-in for the aiobotocore CloudWatch client, used as an async context manager."""
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def get_paginator(self, operation_name):
+        assert operation_name == 'get_metric_data'
+        return StubAsyncPaginator(self)
+
+
+class StubAioSession:
+    def __init__(self, client):
+        self.client = client
+        self.clients_created = 0
+
+    def create_client(self, service_name, config=None):
+        assert service_name == 'cloudwatch'
+        self.clients_created += 1
+        return self.client
+
+
+def _page(results):
+    """Builds a GetMetricData page from {query id: (timestamps, values)}."""
+    return {'MetricDataResults': [{'Id': query_id, 'Timestamps': list(timestamps), 'Values': list(values)}
+                                  for query_id, (timestamps, values) in results.items()]}
+
+
+def _params(**kwargs):
+    return sagemaker_metrics.EndpointMetricParams(endpoint_name='ep', variant_name='v', start_time=T0,
+                                                  end_time=T0 + timedelta(hours=1), **kwargs)
+
+def _all_metric_names():
+    return [name for name, _ in sagemaker_metrics._UTIL_METRICS + sagemaker_metrics._INVOC_METRICS]
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    client = StubCloudWatchClient()
+    monkeypatch.setattr(sagemaker_metrics, '_cw_client', lambda: client)
+    _fetch_all_endpoint_metrics.cache_clear()
+    yield client
+    _fetch_all_endpoint_metrics.cache_clear()
+
+
+@pytest.fixture
+def stub_aio_session(monkeypatch):
+    session = StubAioSession(StubAsyncCloudWatchClient())
+    monkeypatch.setattr(sagemaker_metrics, '_aio_session', lambda: session)
+    # aiobotocore is an optional extra, the stub session accepts a plain botocore config
+    monkeypatch.setattr(sagemaker_metrics, 'AioConfig', sagemaker_metrics.Config)
+    return session
+
+
+def test_align_to_period_naive_treated_as_utc():
+    start, end = _align_to_period(datetime(2026, 1, 1, 10, 10), datetime(2026, 1, 1, 10, 50), 3600)
+    assert start == datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+    assert end == datetime(2026, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+def test_align_to_period_utc():
+    start, end = _align_to_period(datetime(2026, 1, 1, 10, 0, 30, tzinfo=timezone.utc),
+                                  datetime(2026, 1, 1, 11, 0, tzinfo=timezone.utc), 60)
+    assert start == datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+    # Already aligned end times are left as is
+    assert end == datetime(2026, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+def test_align_to_period_non_whole_hour_offset():
+    ist = timezone(timedelta(hours=5, minutes=30))
+    # 10:10-11:50 +05:30 is 04:40-06:20 UTC
+    start, end = _align_to_period(datetime(2026, 1, 1, 10, 10, tzinfo=ist), datetime(2026, 1, 1, 11, 50, tzinfo=ist), 3600)
+    assert start == datetime(2026, 1, 1, 4, 0, tzinfo=timezone.utc)
+    assert end == datetime(2026, 1, 1, 7, 0, tzinfo=timezone.utc)
+
+def test_align_to_period_mixed_naive_and_aware():
+    start, end = _align_to_period(datetime(2026, 1, 1, 10, 10),
+                                  datetime(2026, 1, 1, 12, 10, tzinfo=timezone(timedelta(hours=1))), 3600)
+    assert start == datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+    assert end == datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_fetch_all_aligns_to_invocation_period_with_aggregate_period(stub_client):
+    _fetch_all_endpoint_metrics('ep', 'v', T0 + timedelta(minutes=10), T0 + timedelta(minutes=50),
+                                period=60, aggregate_period=3600)
+    request = stub_client.requests[0]
+    # The invocation queries run at 60s, so the window must not be widened to the hour
+    assert request['StartTime'] == T0 + timedelta(minutes=10)
+    assert request['EndTime'] == T0 + timedelta(minutes=50)
+    periods = {query['Id'][0]: query['MetricStat']['Period'] for query in request['MetricDataQueries']}
+    assert periods == {'u': 3600, 'i': 60}
+
+def test_merge_metric_data_pages_combines_results_per_id():
+    pages = [_page({'u_0': ([T0], [1.0]), 'i_0': ([], [])}),
+             _page({'u_0': ([T0 + timedelta(minutes=1)], [2.0]), 'i_0': ([T0], [5.0])})]
+    results = {result['Id']: result for result in sagemaker_metrics._merge_metric_data_pages(pages)}
+    assert results['u_0']['Timestamps'] == [T0, T0 + timedelta(minutes=1)]
+    assert results['u_0']['Values'] == [1.0, 2.0]
+    assert results['i_0']['Values'] == [5.0]
+
+def test_get_endpoint_metrics_uses_arrow_dtypes_and_nulls(stub_client):
+    stub_client.pages = [_page({'u_0': ([T0, T0 + timedelta(minutes=1)], [1.0, 2.0]), 'i_0': ([T0], [3.0])})]
+    df = sagemaker_metrics.get_endpoint_metrics(_params())
+    assert list(df.columns) == ['Timestamp', 'EndpointName'] + _all_metric_names()
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+    assert str(df['Timestamp'].dtype) == 'timestamp[ms, tz=UTC][pyarrow]'
+    # Gaps are nulls in the Arrow column, not NaN fills
+    assert df['Invocations'].isna().tolist() == [False, True]
+    assert pa.array(df['Invocations']).null_count == 1
+
+def test_fetch_all_keeps_columns_for_metrics_without_data(stub_client):
+    stub_client.pages = [_page({'u_0': ([T0], [7.0]), 'u_4': ([], [])})]
+    df = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert list(df.columns) == ['EndpointName'] + _all_metric_names()
+    assert df['GPUUtilization'].isna().all()
+
+def test_fetch_all_without_data_returns_empty_frame_with_metric_columns(stub_client):
+    stub_client.pages = [_page({'u_0': ([], []), 'i_0': ([], [])})]
+    df = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert df.empty
+    assert list(df.columns) == ['EndpointName'] + _all_metric_names()
+    assert df.index.name == 'Timestamp'
+
+def test_fetch_all_maps_query_ids_to_metric_names(stub_client):
+    # u_0 is CPUUtilization, i_3 is ModelLatency, results come back out of order
+    stub_client.pages = [_page({'i_3': ([T0], [42.0]), 'u_0': ([T0], [7.0])})]
+    df = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert df.loc[T0, 'CPUUtilization'] == 7.0
+    assert df.loc[T0, 'ModelLatency'] == 42.0
+    assert (df['EndpointName'] == 'ep').all()
+
+def test_get_endpoint_metrics_without_data_returns_empty_dataframe(stub_client):
+    stub_client.pages = [_page({'u_0': ([], []), 'i_0': ([], [])})]
+    df = sagemaker_metrics.get_endpoint_metrics(_params())
+    assert isinstance(df, pd.DataFrame)
+    assert df.empty and df.columns.empty
+
+class FrozenDatetime(datetime):
+    """datetime with a settable now(), used to move the cache TTL bucket forward."""
+    current = T0
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+def test_cache_hit_for_same_historical_window(stub_client):
+    stub_client.pages = [_page({'u_0': ([T0], [1.0])})]
+    first = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    second = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert len(stub_client.requests) == 1
+    assert first.equals(second)
+
+def test_cache_expires_for_recent_window_when_bucket_rolls_over(stub_client, monkeypatch):
+    # Buckets are 300s wide, 12:00 starts a new one
+    now = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(sagemaker_metrics, 'datetime', FrozenDatetime)
+    start, end = now - timedelta(minutes=40), now - timedelta(minutes=10)
+    FrozenDatetime.current = now
+    _fetch_all_endpoint_metrics('ep', 'v', start, end)
+    FrozenDatetime.current = now + timedelta(minutes=4)
+    _fetch_all_endpoint_metrics('ep', 'v', start, end)
+    assert len(stub_client.requests) == 1
+    FrozenDatetime.current = now + timedelta(minutes=5)
+    _fetch_all_endpoint_metrics('ep', 'v', start, end)
+    assert len(stub_client.requests) == 2
+
+def test_cache_does_not_store_exceptions(stub_client):
+    stub_client.error = RuntimeError('throttled')
+    with pytest.raises(RuntimeError):
+        _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    stub_client.error = None
+    stub_client.pages = [_page({'u_0': ([T0], [1.0])})]
+    df = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert len(stub_client.requests) == 2
+    assert df.loc[T0, 'CPUUtilization'] == 1.0
+
+def test_cache_returns_copies(stub_client):
+    stub_client.pages = [_page({'u_0': ([T0], [1.0])})]
+    df = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    df.loc[T0, 'CPUUtilization'] = -1.0
+    df['Extra'] = 0
+    cached = _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1))
+    assert cached.loc[T0, 'CPUUtilization'] == 1.0
+    assert 'Extra' not in cached.columns
+
+def test_cache_accepts_positional_aggregate_period(stub_client):
+    _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1), 60, 3600)
+    _fetch_all_endpoint_metrics('ep', 'v', T0, T0 + timedelta(hours=1), 60, aggregate_period=3600)
+    assert len(stub_client.requests) == 1
+    periods = {query['MetricStat']['Period'] for query in stub_client.requests[0]['MetricDataQueries']
+               if query['Id'].startswith('u_')}
+    assert periods == {3600}
+
+@pytest.mark.parametrize('aggregate_period', [0, -60, 90, 30])
+def test_endpoint_metric_params_rejects_invalid_aggregate_period(aggregate_period):
+    with pytest.raises(ValueError):
+        _params(period=60, aggregate_period=aggregate_period)
+
+def test_endpoint_metric_params_rejects_aggregate_period_below_period():
+    with pytest.raises(ValueError):
+        _params(period=300, aggregate_period=120)
+
+def test_endpoint_metric_params_accepts_valid_aggregate_period():
+    assert _params().aggregate_period is None
+    assert _params(period=60, aggregate_period=60).aggregate_period == 60
+    assert _params(period=60, aggregate_period=3600).aggregate_period == 3600
+
+def test_get_endpoint_metrics_async_paginates_with_shared_session(stub_aio_session):
+    client = stub_aio_session.client
+    client.pages = [_page({'u_0': ([T0], [1.0]), 'i_0': ([], [])}),
+                    _page({'u_0': ([T0 + timedelta(minutes=1)], [2.0]), 'i_0': ([T0], [3.0])})]
+    df = asyncio.run(sagemaker_metrics.get_endpoint_metrics_async(_params()))
+    assert df['CPUUtilization'].tolist() == [1.0, 2.0]
+    assert df['Invocations'].isna().tolist() == [False, True]
+    # All queries go out in one paginated request
+    assert len(client.requests) == 1
+    assert len(client.requests[0]['MetricDataQueries']) == len(_all_metric_names())
+    asyncio.run(sagemaker_metrics.get_endpoint_metrics_async(_params()))
+    assert stub_aio_session.clients_created == 2
+
+def test_aio_session_is_cached(monkeypatch):
+    sessions = []
+
+    def _get_session():
+        sessions.append(object())
+        return sessions[-1]
+    monkeypatch.setattr(sagemaker_metrics, 'get_session', _get_session)
+    sagemaker_metrics._aio_session.cache_clear()
+    try:
+        assert sagemaker_metrics._aio_session() is sagemaker_metrics._aio_session()
+        assert len(sessions) == 1
+    finally:
+        sagemaker_metrics._aio_session.cache_clear()
+
+def test_get_endpoint_metrics_async_logs_under_its_own_name(stub_aio_session, caplog):
+    stub_aio_session.client.pages = [_page({'u_0': ([T0], [1.0])})]
+    with caplog.at_level('INFO', logger=sagemaker_metrics.logger.name):
+        asyncio.run(sagemaker_metrics.get_endpoint_metrics_async(_params()))
+    shape_messages = [record.getMessage() for record in caplog.records if 'shape of final metrics' in record.getMessage()]
+    assert shape_messages and all(message.startswith('get_endpoint_metrics_async, ') for message in shape_messages)
+
+@pytest.mark.parametrize('debug, retries', [
+    (True, {'max_attempts': 0, 'mode': 'standard'}),
+    (False, {'max_attempts': 3, 'mode': 'adaptive'}),
+])
+def test_cw_client_config_follows_debug_flag(monkeypatch, debug, retries):
+    monkeypatch.setattr(sagemaker_metrics, 'CLOUDWATCH_DEBUG', debug)
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    sagemaker_metrics._cw_client.cache_clear()
+    try:
+        assert sagemaker_metrics._cw_client_config_args() == {'retries': retries, 'max_pool_connections': 20}
+        config = sagemaker_metrics._cw_client().meta.config
+        assert config.max_pool_connections == 20
+        assert config.retries['mode'] == retries['mode']
+    finally:
+        sagemaker_metrics._cw_client.cache_clear()